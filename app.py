@@ -104,7 +104,7 @@ def run_crawl():
     # asyncio.run(crawler.crawl(urls[0]))
     # items = search(urls, crawl_hosts=True)
 
-    items = sort_urls(list(crawler.items))
+    items = sort_urls(crawler.items.values())
 
     serialized = [item.serialize() for item in items]
 
@@ -114,7 +114,7 @@ def run_crawl():
     results = get_pretty_print(serialized)
     print(results)
 
-    site_metas = [item.serialize() for item in crawler.site_metas]
+    site_metas = [item.serialize() for item in crawler.site_metas.values()]
     metas = get_pretty_print(site_metas)
     print(metas)
     # pprint(site_metas)
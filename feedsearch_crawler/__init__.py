@@ -1,22 +1,66 @@
 import asyncio
+from collections import defaultdict
 import logging
-from xml.etree import ElementTree
-from typing import List, Union
+import re
+from io import BytesIO
+from operator import attrgetter
+from typing import (
+    List,
+    Union,
+    Dict,
+    Iterable,
+    Any,
+    Tuple,
+    Callable,
+    AsyncIterator,
+)
+
+try:
+    # lxml serializes with libxml2, which is much faster than the stdlib ElementTree.
+    from lxml import etree as ElementTree
+
+    HAS_LXML = True
+except ImportError:
+    from xml.etree import ElementTree
+
+    HAS_LXML = False
 
 from yarl import URL
 
+from feedsearch_crawler.crawler.lib import parse_href_to_url, remove_www
 from feedsearch_crawler.feed_spider import FeedsearchSpider, FeedInfo
 
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 name = "Feedsearch Crawler"
 
+# Control characters that are not allowed in XML 1.0, and are rejected by lxml.
+invalid_xml_chars = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def clean_xml_string(value: str) -> str:
+    """
+    Remove characters that are not allowed in XML from a string.
+
+    :param value: String value
+    :return: String without invalid XML characters
+    """
+    return invalid_xml_chars.sub("", value)
+
+
+# Optional FeedInfo fields of OPML outlines, with their outline attribute names and string conversion.
+opml_outline_fields: Tuple[Tuple[str, Tuple[str, ...], Callable[[Any], str]], ...] = (
+    ("title", ("text", "title"), clean_xml_string),
+    ("site_url", ("htmlUrl",), str),
+    ("description", ("description",), clean_xml_string),
+    ("version", ("version",), str),
+)
+
 
 def search(
     url: Union[URL, str, List[Union[URL, str]]],
     try_urls: Union[List[str], bool] = False,
-    *args,
-    **kwargs
+    **kwargs,
 ) -> List[FeedInfo]:
     """
     Search for feeds at a URL.
@@ -25,15 +69,14 @@ def search(
     :param try_urls: Tries different paths that may contain feeds.
     :return: List of FeedInfo objects
     """
-    results = asyncio.run(search_async(url, try_urls=try_urls, *args, **kwargs))
+    results = asyncio.run(search_async(url, try_urls=try_urls, **kwargs))
     return results
 
 
 async def search_async(
     url: Union[URL, str, List[Union[URL, str]]],
     try_urls: Union[List[str], bool] = False,
-    *args,
-    **kwargs
+    **kwargs,
 ) -> List[FeedInfo]:
     """
     Search asynchronously for feeds at a URL.
@@ -42,22 +85,117 @@ async def search_async(
     :param try_urls: Tries different paths that may contain feeds.
     :return: List of FeedInfo objects
     """
-    crawler = FeedsearchSpider(try_urls=try_urls, *args, **kwargs)
+    # Crawl statistics are not returned, so only collect them if asked.
+    kwargs.setdefault("collect_stats", False)
+    crawler = FeedsearchSpider(try_urls=try_urls, **kwargs)
     await crawler.crawl(url)
 
-    return sort_urls(list(crawler.items))
+    return sort_urls(crawler.items.values())
+
+
+async def search_async_iter(
+    url: Union[URL, str, List[Union[URL, str]]],
+    try_urls: Union[List[str], bool] = False,
+    **kwargs,
+) -> AsyncIterator[FeedInfo]:
+    """
+    Search asynchronously for feeds at a URL, yielding each feed as soon as it is found.
+    Feeds are yielded in the order found rather than by score, and their site metadata
+    and favicons are only populated at the end of the crawl.
+
+    :param url: URL or list of URLs to search
+    :param try_urls: Tries different paths that may contain feeds.
+    :return: AsyncIterator of FeedInfo objects
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    kwargs.setdefault("collect_stats", False)
+    crawler = FeedsearchSpider(
+        try_urls=try_urls, feed_callback=queue.put_nowait, **kwargs
+    )
+
+    # Run the crawl alongside the iterator, and mark the end of the feeds when it finishes.
+    crawl = asyncio.ensure_future(crawler.crawl(url))
+    crawl.add_done_callback(lambda _: queue.put_nowait(None))
+    try:
+        while True:
+            feed = await queue.get()
+            if feed is None:
+                break
+            yield feed
+        # Raise any exception from the crawl.
+        await crawl
+    finally:
+        if not crawl.done():
+            crawl.cancel()
+
+
+def search_many(
+    urls: List[Union[URL, str]],
+    try_urls: Union[List[str], bool] = False,
+    **kwargs,
+) -> Dict[Union[URL, str], List[FeedInfo]]:
+    """
+    Search for feeds at many URLs in a single crawl.
+
+    :param urls: List of URLs to search
+    :param try_urls: Tries different paths that may contain feeds.
+    :return: Dictionary of each URL to a list of the FeedInfo objects found from it
+    """
+    return asyncio.run(search_many_async(urls, try_urls=try_urls, **kwargs))
+
+
+async def search_many_async(
+    urls: List[Union[URL, str]],
+    try_urls: Union[List[str], bool] = False,
+    **kwargs,
+) -> Dict[Union[URL, str], List[FeedInfo]]:
+    """
+    Search asynchronously for feeds at many URLs in a single crawl.
+    All URLs share the crawler's connection pool, concurrency limit, and total timeout.
+    Feeds are assigned to each URL with the same host as the start of the crawl path that found them.
+
+    :param urls: List of URLs to search
+    :param try_urls: Tries different paths that may contain feeds.
+    :return: Dictionary of each URL to a list of the FeedInfo objects found from it
+    """
+    # Crawl statistics are not returned, so only collect them if asked.
+    kwargs.setdefault("collect_stats", False)
+    crawler = FeedsearchSpider(try_urls=try_urls, **kwargs)
+    await crawler.crawl(list(urls))
+
+    feeds_by_host: Dict[str, List[FeedInfo]] = defaultdict(list)
+    for feed in crawler.items.values():
+        start_url = crawler.feed_start_urls.get(str(feed.url))
+        if start_url and start_url.host:
+            feeds_by_host[remove_www(start_url.host)].append(feed)
+
+    results = dict()
+    for url in urls:
+        parsed = url
+        if isinstance(url, str):
+            parsed = parse_href_to_url(url if "//" in url else f"//{url}")
+        host = remove_www(parsed.host) if parsed and parsed.host else ""
+        results[url] = sort_urls(feeds_by_host.get(host, []))
+    return results
 
 
-def sort_urls(feeds: List[FeedInfo]) -> List[FeedInfo]:
+def sort_urls(feeds: Iterable[FeedInfo]) -> List[FeedInfo]:
     """
     Sort list of feeds based on Url score
 
-    :param feeds: List of FeedInfo objects
+    :param feeds: Iterable of FeedInfo objects
     :return: List of FeedInfo objects sorted by score
     """
-    feeds = [f for f in feeds if isinstance(f, FeedInfo)]
-    sorted_urls = sorted(list(set(feeds)), key=lambda x: x.score, reverse=True)
-    return sorted_urls
+    # Remove duplicates in a single pass, keeping the highest scoring of feeds with the same URL.
+    # FeedInfo equality and hashing only use the URL.
+    unique_feeds: Dict[FeedInfo, FeedInfo] = dict()
+    for feed in feeds:
+        if not isinstance(feed, FeedInfo):
+            continue
+        existing = unique_feeds.get(feed)
+        if existing is None or feed.score > existing.score:
+            unique_feeds[feed] = feed
+    return sorted(unique_feeds.values(), key=attrgetter("score"), reverse=True)
 
 
 def output_opml(feeds: List[FeedInfo]) -> bytes:
@@ -68,26 +206,61 @@ def output_opml(feeds: List[FeedInfo]) -> bytes:
     :param feeds: List of FeedInfo objects
     :return: OPML file as XML bytestring
     """
+    outlines = (opml_outline_attrib(feed) for feed in feeds if feed.url)
+
+    if HAS_LXML:
+        # Write each outline as it is created, instead of building the whole tree first.
+        buffer = BytesIO()
+        with ElementTree.xmlfile(buffer, encoding="utf-8") as xf:
+            xf.write_declaration()
+            with xf.element("opml", version="2.0"):
+                with xf.element("head"):
+                    with xf.element("title"):
+                        xf.write("Feeds")
+                with xf.element("body"):
+                    for attrib in outlines:
+                        xf.write(ElementTree.Element("outline", attrib))
+        return buffer.getvalue()
+
     root = ElementTree.Element("opml", version="2.0")
     head = ElementTree.SubElement(root, "head")
     title = ElementTree.SubElement(head, "title")
     title.text = "Feeds"
     body = ElementTree.SubElement(root, "body")
+    for attrib in outlines:
+        ElementTree.SubElement(body, "outline", attrib)
+
+    return ElementTree.tostring(
+        root, encoding="utf-8", method="xml", xml_declaration=True
+    )
+
+
+async def output_opml_async(feeds: List[FeedInfo]) -> bytes:
+    """
+    Return feeds as a subscriptionlist OPML file, serialized in the default executor
+    so that the event loop is not blocked by large feed lists.
+
+    :param feeds: List of FeedInfo objects
+    :return: OPML file as XML bytestring
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, output_opml, feeds)
 
-    for feed in feeds:
-        if not feed.url:
-            continue
 
-        fe = ElementTree.SubElement(body, "outline", type="rss", xmlUrl=str(feed.url))
+def opml_outline_attrib(feed: FeedInfo) -> Dict[str, str]:
+    """
+    Return the attributes of the OPML outline element of a feed.
+
+    :param feed: FeedInfo object
+    :return: Dictionary of outline attributes
+    """
+    attrib = {"type": "rss", "xmlUrl": str(feed.url)}
 
-        if feed.title:
-            fe.set("text", feed.title)
-            fe.set("title", feed.title)
-        if feed.site_url:
-            fe.set("htmlUrl", str(feed.site_url))
-        if feed.description:
-            fe.set("description", feed.description)
-        if feed.version:
-            fe.set("version", feed.version)
+    for field, names, to_string in opml_outline_fields:
+        value = getattr(feed, field)
+        if value:
+            value = to_string(value)
+            for name in names:
+                attrib[name] = value
 
-    return ElementTree.tostring(root, encoding="utf8", method="xml")
+    return attrib
@@ -1,13 +1,26 @@
 import asyncio
-import copy
 import inspect
 import logging
+import re
 from abc import ABC, abstractmethod
+from array import array
 from collections import OrderedDict
-from fnmatch import fnmatch
+from functools import lru_cache
+from fnmatch import translate
+from itertools import chain
 from statistics import harmonic_mean, median
-from types import AsyncGeneratorType
-from typing import List, Any, Dict, Set
+from types import AsyncGeneratorType, CoroutineType
+from typing import (
+    List,
+    Any,
+    Dict,
+    Set,
+    Optional,
+    Callable,
+    FrozenSet,
+    Tuple,
+    Iterable,
+)
 from typing import Union
 
 import aiohttp
@@ -41,6 +54,34 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Statistics recorded at the end of a crawl when collect_stats is enabled.
+# Each is the Stats key, the Crawler attribute holding the samples, the aggregate function,
+# and whether the result is converted to an int.
+crawl_statistics: Tuple[Tuple[Stats, str, Callable[[Iterable], Any], bool], ...] = (
+    (Stats.REQUESTS_DURATION_TOTAL, "_stats_request_durations", sum, True),
+    (Stats.REQUESTS_DURATION_AVG, "_stats_request_durations", harmonic_mean, True),
+    (Stats.REQUESTS_DURATION_MAX, "_stats_request_durations", max, True),
+    (Stats.REQUESTS_DURATION_MIN, "_stats_request_durations", min, True),
+    (Stats.REQUESTS_DURATION_MEDIAN, "_stats_request_durations", median, True),
+    (Stats.CONTENT_LENGTH_TOTAL, "_stats_response_content_lengths", sum, True),
+    (Stats.CONTENT_LENGTH_AVG, "_stats_response_content_lengths", harmonic_mean, True),
+    (Stats.CONTENT_LENGTH_MAX, "_stats_response_content_lengths", max, True),
+    (Stats.CONTENT_LENGTH_MIN, "_stats_response_content_lengths", min, True),
+    (Stats.CONTENT_LENGTH_MEDIAN, "_stats_response_content_lengths", median, True),
+    (Stats.QUEUE_WAIT_AVG, "_stats_queue_wait_times", harmonic_mean, False),
+    (Stats.QUEUE_WAIT_MIN, "_stats_queue_wait_times", min, False),
+    (Stats.QUEUE_WAIT_MAX, "_stats_queue_wait_times", max, False),
+    (Stats.QUEUE_WAIT_MEDIAN, "_stats_queue_wait_times", median, False),
+    (Stats.QUEUE_SIZE_MAX, "_stats_queue_sizes", max, False),
+    (Stats.QUEUE_SIZE_AVG, "_stats_queue_sizes", harmonic_mean, True),
+    (Stats.QUEUE_SIZE_MEDIAN, "_stats_queue_sizes", median, True),
+    (Stats.REQUESTS_LATENCY_AVG, "_stats_request_latencies", harmonic_mean, False),
+    (Stats.REQUESTS_LATENCY_MAX, "_stats_request_latencies", max, True),
+    (Stats.REQUESTS_LATENCY_MIN, "_stats_request_latencies", min, True),
+    (Stats.REQUESTS_LATENCY_MEDIAN, "_stats_request_latencies", median, True),
+    (Stats.REQUESTS_LATENCY_TOTAL, "_stats_request_latencies", sum, True),
+)
+
 
 class Crawler(ABC):
 
@@ -56,6 +97,10 @@ class Crawler(ABC):
     start_urls = []
     # Domain patterns that are allowed to be crawled.
     allowed_domains = []
+    # Allowed domain patterns that _is_allowed_host was compiled from.
+    _allowed_host_patterns: Tuple[str, ...] = ()
+    # Cached check of a host against the allowed domain patterns. None if all domains are allowed.
+    _is_allowed_host: Optional[Callable[[str], bool]] = None
 
     # Max number of concurrent http requests.
     concurrency: int = 10
@@ -75,8 +120,6 @@ class Crawler(ABC):
     _session: aiohttp.ClientSession
     # Task queue for Requests. Created on Crawl start.
     _request_queue: CrawlerPriorityQueue
-    # Semaphore for controlling HTTP Request concurrency.
-    _semaphore: asyncio.Semaphore
 
     def __init__(
         self,
@@ -94,6 +137,7 @@ class Crawler(ABC):
         max_retries: int = 3,
         ssl: bool = False,
         trace: bool = False,
+        collect_stats: bool = True,
         *args,
         **kwargs,
     ):
@@ -115,6 +159,7 @@ class Crawler(ABC):
         :param max_retries: Maximum number of retries for each failed HTTP request.
         :param ssl: Enables strict SSL checking.
         :param trace: Enables aiohttp trace debugging.
+        :param collect_stats: Enables collection of timing and size statistics. Request counts are always collected.
         :param args: Additional positional arguments for subclasses.
         :param kwargs: Additional keyword arguments for subclasses.
         """
@@ -143,11 +188,15 @@ class Crawler(ABC):
         if headers:
             self.headers = {**self.headers, **headers}
 
-        self.allowed_schemes = allowed_schemes
+        # Stored as a lowercase set, as yarl URL schemes are always lowercase.
+        self.allowed_schemes: FrozenSet[str] = frozenset(
+            scheme.lower() for scheme in allowed_schemes or []
+        )
         self.delay = delay
         self.max_retries = max_retries
         self._ssl = ssl
         self._trace = trace
+        self.collect_stats = collect_stats
 
         # Default set for parsed items.
         self.items: set = set()
@@ -161,10 +210,14 @@ class Crawler(ABC):
         self._stats_request_latencies = []
         # List of Content Length in bytes of all Responses.
         self._stats_response_content_lengths = []
-        # List of time in Milliseconds that each item spend on the queue.
-        self._stats_queue_wait_times = []
-        # List of the size of the queue each time an item was popped off the queue.
-        self._stats_queue_sizes = []
+        # Time in Milliseconds that each item spend on the queue.
+        # Queue samples are taken for every queue item, so are stored as unboxed arrays rather than lists.
+        self._stats_queue_wait_times = array("d")
+        # Size of the queue each time an item was popped off the queue.
+        self._stats_queue_sizes = array("L")
+        # Total number of objects put on the queue. Copied to the stats when the crawl finishes,
+        # as _put_queue is called too often for a stats dict update to be free.
+        self._queued_total = 0
 
         # Initialise Crawl Statistics.
         self.stats: dict = {
@@ -210,13 +263,14 @@ class Crawler(ABC):
 
             start = time.perf_counter()
 
-            # Fetch the request and run its callback
-            # results, response = await request.fetch_callback(self._semaphore)
+            # Fetch the request and run its callback.
+            # HTTP Request concurrency is limited by the ClientSession connection pool.
             results, response = await request.fetch_callback()
 
             dur = int((time.perf_counter() - start) * 1000)
-            self._stats_request_durations.append(dur)
-            self._stats_request_latencies.append(request.req_latency)
+            if self.collect_stats:
+                self._stats_request_durations.append(dur)
+                self._stats_request_latencies.append(request.req_latency)
             logger.debug(
                 "Fetched: url=%s dur=%dms latency=%dms read=%dms status=%s prev=%s",
                 response.url,
@@ -237,11 +291,12 @@ class Crawler(ABC):
             else:
                 self.stats[Stats.STATUS_CODES][response.status_code] = 1
 
-            self._stats_response_content_lengths.append(response.content_length)
+            if self.collect_stats:
+                self._stats_response_content_lengths.append(response.content_length)
 
             # Mark the Response URL as seen in the duplicate filter, as it may be different from the Request URL
             # due to redirects.
-            await self._duplicate_filter.url_seen(response.url, response.method)
+            self._duplicate_filter.seen_or_add(response.url, response.method)
 
             # Add callback results to the queue for processing.
             if results:
@@ -284,12 +339,12 @@ class Crawler(ABC):
                 )
             # For async generators, put each value back on the queue for processing.
             # This will happen recursively until the end of the recursion chain or max_callback_recursion is reached.
-            elif inspect.isasyncgen(result):
+            elif isinstance(result, AsyncGeneratorType):
                 async for value in result:
                     if value:
                         self._put_queue(CallbackResult(value, callback_recursion + 1))
             # For coroutines, await the result then put the value back on the queue for further processing.
-            elif inspect.iscoroutine(result):
+            elif isinstance(result, CoroutineType):
                 value = await result
                 self._put_queue(CallbackResult(value, callback_recursion + 1))
             # Requests are put onto the queue to be fetched.
@@ -318,6 +373,30 @@ class Crawler(ABC):
         # Add the Request to the queue for processing.
         self._put_queue(request)
 
+    def _get_allowed_host_check(self) -> Optional[Callable[[str], bool]]:
+        """
+        Return the check of a host against the allowed domain patterns, compiling the patterns
+        into a single regex when they have changed. Matches are cached by host, as most URLs in a
+        crawl share a few hosts.
+
+        :return: Host check function, or None if all domains are allowed.
+        """
+        patterns = tuple(self.allowed_domains or ())
+        if patterns == self._allowed_host_patterns:
+            return self._is_allowed_host
+
+        self._allowed_host_patterns = patterns
+        self._is_allowed_host = None
+        if patterns:
+            regex = re.compile("|".join(translate(p) for p in patterns))
+
+            @lru_cache(maxsize=8192)
+            def is_allowed_host(host: str) -> bool:
+                return regex.match(host) is not None
+
+            self._is_allowed_host = is_allowed_host
+        return self._is_allowed_host
+
     def is_allowed_domain(self, url: URL) -> bool:
         """
         Check that the URL host is in the list of allowed domain patterns.
@@ -327,16 +406,14 @@ class Crawler(ABC):
         :param url: URL object
         :return: boolean
         """
-        if not self.allowed_domains:
+        is_allowed_host = self._get_allowed_host_check()
+        if not is_allowed_host:
             return True
 
         try:
             if not url or not url.host:
                 return False
-            host = url.host
-            for domain_pattern in self.allowed_domains:
-                if fnmatch(host, domain_pattern):
-                    return True
+            return is_allowed_host(url.host)
         except Exception as e:
             logger.warning(e)
         return False
@@ -383,7 +460,7 @@ class Crawler(ABC):
         :param cb_kwargs: Optional Dictionary of keyword arguments to be passed to the callback function.
         :return: Request
         """
-        original_url = copy.copy(url)
+        original_url = url
         if isinstance(url, str):
             url = parse_href_to_url(url)
 
@@ -406,7 +483,8 @@ class Crawler(ABC):
                 return
 
             # Copy the Response history so that it isn't a reference to a mutable object.
-            history = copy.deepcopy(response.history)
+            # The history only contains immutable URLs, so a shallow copy is enough.
+            history = list(response.history)
         else:
             if not url.is_absolute():
                 logger.debug("URL should have domain: %s", url)
@@ -426,7 +504,7 @@ class Crawler(ABC):
             return
 
         # Check if URL is not already seen, and add it to the duplicate filter seen list.
-        if await self._duplicate_filter.url_seen(url, method):
+        if self._duplicate_filter.seen_or_add(url, method):
             return
 
         request = Request(
@@ -489,22 +567,29 @@ class Crawler(ABC):
             raise ValueError("Object must inherit from Queueable Class")
 
         queueable.add_to_queue(self._request_queue)
-        self.stats[Stats.QUEUED_TOTAL] += 1
+        self._queued_total += 1
 
     async def _work(self, task_num):
         """
         Worker function for handling request queue items.
         """
+        # Bind attributes that are used on every loop iteration to locals.
+        # The queue and statistics buffers aren't replaced while the workers are running.
+        queue = self._request_queue
+        collect_stats = self.collect_stats
+        queue_sizes = self._stats_queue_sizes
+        queue_wait_times = self._stats_queue_wait_times
         try:
             while True:
-                self._stats_queue_sizes.append(self._request_queue.qsize())
-                item: Queueable = await self._request_queue.get()
+                if collect_stats:
+                    queue_sizes.append(queue.qsize())
+                item: Queueable = await queue.get()
                 # logger.debug("Priority: %s Item: %s", item.priority, item)
-                if item.get_queue_wait_time():
-                    # logger.debug(
-                    #     "Waited: %sms Item: %s", item.get_queue_wait_time(), item
-                    # )
-                    self._stats_queue_wait_times.append(item.get_queue_wait_time())
+                if collect_stats:
+                    wait_time = item.get_queue_wait_time()
+                    if wait_time:
+                        # logger.debug("Waited: %sms Item: %s", wait_time, item)
+                        queue_wait_times.append(wait_time)
 
                 if self._session.closed:
                     logger.debug("Session is closed. Cannot run %s", item)
@@ -522,7 +607,7 @@ class Crawler(ABC):
                 except Exception as e:
                     logger.exception("Error handling item: %s : %s", item, e)
                 finally:
-                    self._request_queue.task_done()
+                    queue.task_done()
         except asyncio.CancelledError:
             logger.debug("Cancelled Worker: %s", task_num)
 
@@ -553,13 +638,14 @@ class Crawler(ABC):
         """
         crawl_start_urls: Set[URL] = set()
 
-        for url in urls + self.start_urls:
+        for url in chain(urls, self.start_urls):
             if isinstance(url, str):
                 if "//" not in url:
                     url = f"//{url}"
                 url = URL(url)
 
-            if url.scheme.lower() not in ["http", "https"]:
+            # yarl normalises the scheme to lowercase.
+            if url.scheme not in ("http", "https"):
                 url = url.with_scheme("http")
 
             crawl_start_urls.add(url)
@@ -570,60 +656,11 @@ class Crawler(ABC):
         """
         Record statistics.
         """
-        self.stats[Stats.REQUESTS_DURATION_TOTAL] = int(
-            sum(self._stats_request_durations)
-        )
-        self.stats[Stats.REQUESTS_DURATION_AVG] = int(
-            harmonic_mean(self._stats_request_durations)
-        )
-        self.stats[Stats.REQUESTS_DURATION_MAX] = int(
-            max(self._stats_request_durations)
-        )
-        self.stats[Stats.REQUESTS_DURATION_MIN] = int(
-            min(self._stats_request_durations)
-        )
-        self.stats[Stats.REQUESTS_DURATION_MEDIAN] = int(
-            median(self._stats_request_durations)
-        )
-
-        self.stats[Stats.CONTENT_LENGTH_TOTAL] = int(
-            sum(self._stats_response_content_lengths)
-        )
-        self.stats[Stats.CONTENT_LENGTH_AVG] = int(
-            harmonic_mean(self._stats_response_content_lengths)
-        )
-        self.stats[Stats.CONTENT_LENGTH_MAX] = int(
-            max(self._stats_response_content_lengths)
-        )
-        self.stats[Stats.CONTENT_LENGTH_MIN] = int(
-            min(self._stats_response_content_lengths)
-        )
-        self.stats[Stats.CONTENT_LENGTH_MEDIAN] = int(
-            median(self._stats_response_content_lengths)
-        )
-
-        self.stats[Stats.URLS_SEEN] = len(self._duplicate_filter.fingerprints)
-
-        self.stats[Stats.QUEUE_WAIT_AVG] = harmonic_mean(self._stats_queue_wait_times)
-        self.stats[Stats.QUEUE_WAIT_MIN] = min(self._stats_queue_wait_times)
-        self.stats[Stats.QUEUE_WAIT_MAX] = max(self._stats_queue_wait_times)
-        self.stats[Stats.QUEUE_WAIT_MEDIAN] = median(self._stats_queue_wait_times)
-
-        self.stats[Stats.QUEUE_SIZE_MAX] = max(self._stats_queue_sizes)
-        self.stats[Stats.QUEUE_SIZE_AVG] = int(harmonic_mean(self._stats_queue_sizes))
-        self.stats[Stats.QUEUE_SIZE_MEDIAN] = int(median(self._stats_queue_sizes))
-
-        self.stats[Stats.REQUESTS_LATENCY_AVG] = harmonic_mean(
-            self._stats_request_latencies
-        )
-        self.stats[Stats.REQUESTS_LATENCY_MAX] = int(max(self._stats_request_latencies))
-        self.stats[Stats.REQUESTS_LATENCY_MIN] = int(min(self._stats_request_latencies))
-        self.stats[Stats.REQUESTS_LATENCY_MEDIAN] = int(
-            median(self._stats_request_latencies)
-        )
-        self.stats[Stats.REQUESTS_LATENCY_TOTAL] = int(
-            sum(self._stats_request_latencies)
-        )
+        stats = {}
+        for key, samples_name, aggregate, to_int in crawl_statistics:
+            value = aggregate(getattr(self, samples_name))
+            stats[key] = int(value) if to_int else value
+        self.stats.update(stats)
 
     def get_stats(self) -> dict:
         """
@@ -657,17 +694,19 @@ class Crawler(ABC):
         # Create the Request Queue within the asyncio loop.
         self._request_queue = CrawlerPriorityQueue()
 
-        # Create the Semaphore for controlling HTTP Request concurrency within the asyncio loop.
-        self._semaphore = asyncio.Semaphore(self.concurrency)
-
         trace_configs = []
         if self._trace:
             trace_configs.append(add_trace_config())
 
+        # Cap the number of simultaneous connections, and so concurrent HTTP requests, at the crawl concurrency.
+        # DNS lookups are cached for the length of the crawl.
         conn = aiohttp.TCPConnector(
-            limit=0, ssl=self._ssl, ttl_dns_cache=self.total_timeout.total
+            limit=self.concurrency,
+            ssl=self._ssl,
+            ttl_dns_cache=self.total_timeout.total,
         )
         # Create the ClientSession for HTTP Requests within the asyncio loop.
+        # A single ClientSession is shared by all Requests for the whole crawl.
         self._session = aiohttp.ClientSession(
             timeout=self.total_timeout,
             headers=self.headers,
@@ -683,7 +722,7 @@ class Crawler(ABC):
 
         # Create workers to process the Request Queue.
         # Create twice as many workers as potential concurrent requests, to help handle request callbacks without
-        # delay while other workers may be locked by the Semaphore.
+        # delay while other workers may be waiting for a connection from the pool.
         self._workers = [
             asyncio.create_task(self._work(i)) for i in range(self.concurrency * 2)
         ]
@@ -712,8 +751,11 @@ class Crawler(ABC):
 
         duration = int((time.perf_counter() - start) * 1000)
         self.stats[Stats.TOTAL_DURATION] = duration
+        self.stats[Stats.QUEUED_TOTAL] = self._queued_total
+        self.stats[Stats.URLS_SEEN] = len(self._duplicate_filter.fingerprints)
 
-        self.record_statistics()
+        if self.collect_stats:
+            self.record_statistics()
 
         logger.info(
             "Crawl finished: requests=%s time=%dms",
@@ -1,10 +1,14 @@
-import asyncio
 import hashlib
 
 from yarl import URL
 
 from feedsearch_crawler.crawler.lib import to_bytes
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
 
 class DuplicateFilter:
     """
@@ -14,24 +18,34 @@ class DuplicateFilter:
     def __init__(self):
         # Dictionary whose keys are the hashed fingerprints of the URLs
         self.fingerprints = dict()
-        # Locks the fingerprints dict when accessing keys.
-        self._seen_lock = asyncio.Lock()
 
-    async def url_seen(self, url: URL, method: str = "") -> bool:
+    def seen_or_add(self, url: URL, method: str = "") -> bool:
         """
         Checks if the URL has already been seen, and adds the URL fingerprint if not.
 
+        The check and add don't yield to the event loop, so no lock is needed
+        when called from multiple tasks.
+
         :param url: URL object
         :param method: Optional HTTP method to use for hashing
         :return: True if URL already seen
         """
         url_str: str = self.parse_url(url)
         fp = self.url_fingerprint_hash(url_str, method)
-        async with self._seen_lock:
-            if fp in self.fingerprints:
-                return True
-            self.fingerprints[fp] = url_str
-            return False
+        if fp in self.fingerprints:
+            return True
+        self.fingerprints[fp] = url_str
+        return False
+
+    async def url_seen(self, url: URL, method: str = "") -> bool:
+        """
+        Async version of seen_or_add.
+
+        :param url: URL object
+        :param method: Optional HTTP method to use for hashing
+        :return: True if URL already seen
+        """
+        return self.seen_or_add(url, method)
 
     def parse_url(self, url: URL) -> str:
         """
@@ -46,11 +60,15 @@ class DuplicateFilter:
     def url_fingerprint_hash(url: str, method: str = "") -> str:
         """
         Create a fingerprint hash of a URL string along with the method if provided.
+        Uses the non-cryptographic xxHash if installed, otherwise SHA1.
 
         :param url: URL as string
         :param method: Optional HTTP method
         :return: Hashed string
         """
+        if xxhash:
+            return xxhash.xxh3_128_hexdigest(to_bytes(url) + to_bytes(method))
+
         # noinspection InsecureHash
         fp = hashlib.sha1()
         fp.update(to_bytes(url))
@@ -2,6 +2,8 @@ from abc import ABC
 
 
 class Item(ABC):
+    # Subclasses declare their attributes in __slots__, and set their defaults before calling __init__.
+    __slots__ = ()
     ignore_item = False
 
     def __init__(self, **kwargs):
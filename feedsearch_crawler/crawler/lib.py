@@ -1,8 +1,10 @@
+import heapq
 import logging
 from asyncio import PriorityQueue
 from dataclasses import dataclass
+from itertools import count
 from enum import Enum
-from typing import Any, Union, Dict
+from typing import Any, Union, Dict, List
 
 from yarl import URL
 
@@ -13,8 +15,26 @@ logger = logging.getLogger(__name__)
 
 # noinspection PyUnresolvedReferences
 class CrawlerPriorityQueue(PriorityQueue):
+    """
+    Priority Queue of Queueable objects.
+
+    Objects are stored on the heap as (priority, insertion count, object) tuples, so that the heap
+    compares ints in C rather than calling Queueable.__lt__, and objects of equal priority are
+    returned in the order they were queued.
+    """
+
     _unfinished_tasks: int
 
+    def _init(self, maxsize):
+        super()._init(maxsize)
+        self._counter = count()
+
+    def _put(self, item: Queueable):
+        heapq.heappush(self._queue, (item.priority, next(self._counter), item))
+
+    def _get(self) -> Queueable:
+        return heapq.heappop(self._queue)[2]
+
     def clear(self):
         """
         Clear the Queue of any unfinished tasks.
@@ -288,3 +308,17 @@ def is_same_domain(root_domain: str, url_domain: str) -> bool:
     :return: boolean
     """
     return remove_www(root_domain) in url_domain
+
+
+def host_suffixes(host: str) -> List[str]:
+    """
+    Return the host and each of its parent domains, from most to least specific.
+    e.g. "feeds.test.com" -> ["feeds.test.com", "test.com", "com"]
+
+    :param host: URL host without scheme or path.
+    :return: List of host strings.
+    """
+    if not host:
+        return []
+    labels = host.split(".")
+    return [".".join(labels[i:]) for i in range(len(labels))]
@@ -2,6 +2,7 @@ import asyncio
 import copy
 import json
 import logging
+import re
 import uuid
 from asyncio import Semaphore, IncompleteReadError, LimitOverrunError, CancelledError
 from random import random
@@ -15,8 +16,16 @@ from yarl import URL
 from feedsearch_crawler.crawler.queueable import Queueable
 from feedsearch_crawler.crawler.response import Response
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Matches text that starts with a JSON object or array, ignoring leading whitespace.
+json_start_regex = re.compile(r"\s*[{\[]")
+
 
 class Request(Queueable):
     METHOD = ["GET", "POST"]
@@ -140,7 +149,8 @@ class Request(Queueable):
         await self.delay_request()
 
         # Copy the Request history so that it isn't a pointer.
-        history = copy.deepcopy(self.history)
+        # The history only contains immutable URLs, so a shallow copy is enough.
+        history = list(self.history)
 
         # Make sure that retry is reset.
         self.should_retry = False
@@ -165,7 +175,9 @@ class Request(Queueable):
                     return self._failed_response(413)
 
                 # Read the response content, and fail the response if the actual content size is too large.
-                content_read, actual_content_length = await self._read_response(resp)
+                content_read, actual_content_length = await self._read_response(
+                    resp, content_length
+                )
                 if not content_read:
                     return self._failed_response(413)
 
@@ -250,11 +262,13 @@ class Request(Queueable):
 
         :return: asyncio HTTP Request
         """
-        if self.method.upper() == "GET":
+        # The method is uppercased when the Request is created.
+        method = self.method
+        if method == "GET":
             return self.request_session.get(
                 self.url, headers=self.headers, timeout=self.timeout, params=self.params
             )
-        elif self.method.upper() == "POST":
+        elif method == "POST":
             return self.request_session.post(
                 self.url,
                 headers=self.headers,
@@ -268,19 +282,34 @@ class Request(Queueable):
                 "HTTP method %s is not valid. Must be GET or POST", self.method
             )
 
-    async def _read_response(self, resp) -> Tuple[bool, int]:
+    async def _read_response(self, resp, content_length: int = 0) -> Tuple[bool, int]:
         """
         Read HTTP Response content as bytes.
 
         :param resp: asyncio HTTP Response
+        :param content_length: Content-Length header value, or 0 if not known
         :return: Tuple (read status, content length in bytes)
         """
-        body: bytes = b""
+        # If the body is known to be within the max size, read it in one go.
+        # Compressed bodies may decompress to more than their Content-Length, so are read in chunks.
+        if 0 < content_length <= self.max_content_length and not resp.headers.get(
+            hdrs.CONTENT_ENCODING
+        ):
+            try:
+                body = await resp.read()
+            except (IncompleteReadError, LimitOverrunError) as e:
+                logger.exception("Failed to read Response content: %s: %s", self, e)
+                return False, 0
+            return True, len(body)
+
+        # Extend a bytearray rather than concatenating bytes, which would copy the whole body for every chunk.
+        body = bytearray()
         try:
-            async for chunk in resp.content.iter_chunked(1024):
+            # Read the data as it arrives, rather than in small fixed size chunks.
+            async for chunk in resp.content.iter_any():
                 if not chunk:
                     break
-                body += chunk
+                body.extend(chunk)
                 if len(body) > self.max_content_length:
                     logger.debug(
                         "Content Length of Response body greater than max %d: %s",
@@ -291,7 +320,7 @@ class Request(Queueable):
         except (IncompleteReadError, LimitOverrunError) as e:
             logger.exception("Failed to read Response content: %s: %s", self, e)
             return False, 0
-        resp._body = body
+        resp._body = bytes(body)
         return True, len(body)
 
     @staticmethod
@@ -304,15 +333,21 @@ class Request(Queueable):
         """
 
         # If the text hasn't been parsed then we won't be able to parse JSON either.
-        if not resp_text:
+        # Most responses are HTML or XML, so check the first character before attempting to parse the text.
+        if not resp_text or not json_start_regex.match(resp_text):
             return None
 
-        stripped = resp_text.strip()  # type: ignore
-        if not stripped:
-            return None
+        # The JSON parsers ignore surrounding whitespace, so the text doesn't need to be stripped.
+        if orjson:
+            try:
+                return orjson.loads(resp_text)
+            except ValueError:
+                # orjson rejects some JSON that the stdlib parser accepts, such as integers wider than
+                # 64 bits and NaN or Infinity, so try again with json.loads.
+                pass
 
         try:
-            return json.loads(stripped)
+            return json.loads(resp_text)
         except ValueError:
             return None
 
@@ -1,3 +1,5 @@
+from typing import FrozenSet
+
 from w3lib.url import url_query_cleaner, canonicalize_url
 from yarl import URL
 
@@ -5,12 +7,14 @@ from feedsearch_crawler.crawler import DuplicateFilter
 
 
 class NoQueryDupeFilter(DuplicateFilter):
-    valid_keys = ["feedformat", "feed", "rss", "atom", "jsonfeed", "format", "podcast"]
+    valid_keys: FrozenSet[str] = frozenset(
+        ["feedformat", "feed", "rss", "atom", "jsonfeed", "format", "podcast"]
+    )
 
     def parse_url(self, url: URL) -> str:
         # Keep the query strings if they might be feed strings.
         # Wikipedia for example uses query strings to differentiate feeds.
-        if any(key in url.query for key in self.valid_keys):
+        if not self.valid_keys.isdisjoint(url.query):
             return canonicalize_url(str(url))
 
         # Canonicalizing the URL is about 4x slower, but worth it to prevent duplicate requests.
@@ -4,12 +4,23 @@ from feedsearch_crawler.crawler import Item
 
 
 class Favicon(Item):
-    url: URL = None
-    priority: int = 0
-    rel: str = ""
-    data_uri: str = ""
-    resp_url: URL = None
-    site_host: str = ""
+    __slots__ = (
+        "url",
+        "priority",
+        "rel",
+        "data_uri",
+        "resp_url",
+        "site_host",
+    )
+
+    def __init__(self, **kwargs) -> None:
+        self.url: URL = None
+        self.priority: int = 0
+        self.rel: str = ""
+        self.data_uri: str = ""
+        self.resp_url: URL = None
+        self.site_host: str = ""
+        super().__init__(**kwargs)
 
     def __eq__(self, other):
         return isinstance(other, self.__class__) and self.url == other.url
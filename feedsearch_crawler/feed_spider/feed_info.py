@@ -7,25 +7,49 @@ from feedsearch_crawler.crawler import Item, to_string
 
 
 class FeedInfo(Item):
-    bozo: int = 0
-    content_length: int = 0
-    content_type: str = ""
-    description: str = ""
-    favicon: URL = ""
-    favicon_data_uri: str = ""
-    hubs: List[str] = []
-    is_podcast: bool = False
-    is_push: bool = False
-    item_count: int = 0
-    last_updated: datetime = None
-    score: int = 0
-    self_url: URL = ""
-    site_name: str = ""
-    site_url: URL = ""
-    title: str = ""
-    url: URL = ""
-    velocity: float = 0
-    version: str = ""
+    __slots__ = (
+        "bozo",
+        "content_length",
+        "content_type",
+        "description",
+        "favicon",
+        "favicon_data_uri",
+        "hubs",
+        "is_podcast",
+        "is_push",
+        "item_count",
+        "last_updated",
+        "score",
+        "self_url",
+        "site_name",
+        "site_url",
+        "title",
+        "url",
+        "velocity",
+        "version",
+    )
+
+    def __init__(self, **kwargs) -> None:
+        self.bozo: int = 0
+        self.content_length: int = 0
+        self.content_type: str = ""
+        self.description: str = ""
+        self.favicon: URL = ""
+        self.favicon_data_uri: str = ""
+        self.hubs: List[str] = []
+        self.is_podcast: bool = False
+        self.is_push: bool = False
+        self.item_count: int = 0
+        self.last_updated: datetime = None
+        self.score: int = 0
+        self.self_url: URL = ""
+        self.site_name: str = ""
+        self.site_url: URL = ""
+        self.title: str = ""
+        self.url: URL = ""
+        self.velocity: float = 0
+        self.version: str = ""
+        super().__init__(**kwargs)
 
     def serialize(self):
         last_updated = self.last_updated.isoformat() if self.last_updated else ""
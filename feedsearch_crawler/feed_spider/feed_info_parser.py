@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from datetime import datetime, date
 from statistics import mean
@@ -23,6 +24,9 @@ from feedsearch_crawler.feed_spider.lib import (
 
 logger = logging.getLogger(__name__)
 
+# Minimum size in bytes of an XML feed to be parsed in the default executor instead of on the event loop.
+EXECUTOR_PARSE_MIN_SIZE = 64 * 1024
+
 
 class FeedInfoParser(ItemParser):
     async def parse_item(
@@ -54,12 +58,20 @@ class FeedInfoParser(ItemParser):
             if parse_type == ParseTypes.JSON:
                 valid_feed = self.parse_json(item, response.json)
             elif parse_type == ParseTypes.XML:
-                valid_feed = self.parse_xml(
+                xml_args = (
                     item,
                     response.data,
                     response.encoding,
                     headers_to_dict(response.headers),
                 )
+                # Parsing large feeds blocks the event loop for long enough to stall other requests.
+                if response.data and len(response.data) > EXECUTOR_PARSE_MIN_SIZE:
+                    loop = asyncio.get_running_loop()
+                    valid_feed = await loop.run_in_executor(
+                        None, self.parse_xml, *xml_args
+                    )
+                else:
+                    valid_feed = self.parse_xml(*xml_args)
 
             if not valid_feed:
                 logger.debug("Invalid Feed: %s", item)
@@ -425,7 +437,7 @@ class FeedInfoParser(ItemParser):
         else:
             score += int(item.velocity)
 
-        if any(map(url_str.count, ["/home", "/top", "/most", "/magazine"])):
+        if any(value in url_str for value in ("/home", "/top", "/most", "/magazine")):
             score += 10
 
         kw = ["atom", "rss", ".xml", "feed", "rdf"]
@@ -1,6 +1,6 @@
 import cgi
 from datetime import datetime
-from typing import Union, List
+from typing import Union, List, Any
 
 from dateutil import tz, parser
 from yarl import URL
@@ -11,6 +11,73 @@ class ParseTypes:
     XML = "xml"
 
 
+def is_parseable_content_type(content_type: str) -> bool:
+    """
+    Check if a Content-Type header value may contain HTML, XML, or JSON that is worth parsing.
+    A missing Content-Type is assumed to be parseable.
+
+    :param content_type: Content-Type header string of the response
+    :return: boolean
+    """
+    mimetype = content_type.split(";", 1)[0].strip().lower()
+    if not mimetype or mimetype.startswith("text/"):
+        return True
+    return mimetype.endswith(("xml", "json"))
+
+
+# Mimetypes that are only used for RSS and Atom feeds.
+XML_FEED_MIMETYPES = frozenset({"application/rss+xml", "application/atom+xml"})
+
+
+def is_xml_feed_content_type(content_type: str) -> bool:
+    """
+    Check if a Content-Type header value declares an RSS or Atom feed.
+    Generic XML types are not included, as they are also used for sitemaps and XHTML.
+
+    :param content_type: Content-Type header string of the response
+    :return: boolean
+    """
+    return content_type.split(";", 1)[0].strip().lower() in XML_FEED_MIMETYPES
+
+
+# Magic bytes at the start of supported favicon image formats.
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+ICO_MAGIC = b"\x00\x00\x01\x00"
+JPEG_MAGIC = b"\xff\xd8\xff"
+
+
+def get_image_mimetype(data: bytes) -> str:
+    """
+    Find the mimetype of favicon image data from its magic bytes.
+
+    :param data: Image data as bytes
+    :return: Image mimetype, or an empty string if the data is not a supported image type
+    """
+    if data.startswith(PNG_MAGIC):
+        return "image/png"
+    if data.startswith(ICO_MAGIC):
+        return "image/x-icon"
+    if data.startswith(JPEG_MAGIC):
+        return "image/jpeg"
+    return ""
+
+
+def is_json_feed(data: Any) -> bool:
+    """
+    Check if parsed JSON data is a JSON Feed.
+    https://jsonfeed.org/version/1.1
+
+    The version is the only top-level key that identifies a JSON Feed, as feed_url is optional.
+
+    :param data: Parsed JSON data
+    :return: boolean
+    """
+    if not isinstance(data, dict):
+        return False
+    version = data.get("version")
+    return isinstance(version, str) and "jsonfeed.org" in version
+
+
 def get_site_root(url: Union[str, URL]) -> str:
     """
     Find the root domain of a url
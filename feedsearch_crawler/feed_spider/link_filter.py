@@ -1,7 +1,9 @@
 import logging
-import pathlib
 import re
-from typing import Optional, Tuple, List
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Optional, Tuple, List, FrozenSet, Any
 
 import bs4
 from w3lib.url import url_query_cleaner
@@ -12,33 +14,48 @@ from feedsearch_crawler.crawler.lib import parse_href_to_url
 from feedsearch_crawler.feed_spider.regexes import (
     feedlike_regex,
     podcast_regex,
-    author_regex,
     date_regex,
+    feedlike_lower_regex,
+    podcast_lower_regex,
+    author_lower_regex,
+    feedlike_or_podcast_lower_regex,
+    FEEDLIKE_PATTERN,
+    PODCAST_PATTERN,
+    AUTHOR_PATTERN,
 )
 
-# List of invalid filetypes
-invalid_filetypes: List[str] = [
-    "jpeg",
-    "jpg",
-    "png",
-    "gif",
-    "bmp",
-    "mp4",
-    "mp3",
-    "mkv",
-    "md",
-    "css",
-    "avi",
-    "pdf",
-    "js",
-    "woff",
-    "woff2",
-    "svg",
-    "ttf",
-]
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Set of invalid filetypes
+invalid_filetypes: FrozenSet[str] = frozenset(
+    {
+        "jpeg",
+        "jpg",
+        "png",
+        "gif",
+        "bmp",
+        "mp4",
+        "mp3",
+        "mkv",
+        "md",
+        "css",
+        "avi",
+        "pdf",
+        "js",
+        "woff",
+        "woff2",
+        "svg",
+        "ttf",
+    }
+)
 
-# List of strings that are invalid as querystring keys
-invalid_querystring_keys: List[str] = ["comment", "comments", "post", "view", "theme"]
+# Set of strings that are invalid as querystring keys
+invalid_querystring_keys: FrozenSet[str] = frozenset(
+    {"comment", "comments", "post", "view", "theme"}
+)
 
 # List of strings that indicate a URL is invalid for crawling
 invalid_url_contents: List[str] = [
@@ -61,13 +78,166 @@ low_priority_urls: List[str] = [
     "video",
 ]
 
+# Href prefixes of links that can never be crawled
+unfollowable_href_prefixes: Tuple[str, ...] = (
+    "#",
+    "javascript:",
+    "data:",
+    "mailto:",
+    "tel:",
+)
+
 # Link Types that should always be searched for feeds
-feed_link_types: List[str] = ["application/json", "rss", "atom", "rdf"]
+feed_link_types: Tuple[str, ...] = ("application/json", "rss", "atom", "rdf")
+
+# Stdlib regexes matching any of the strings in a lowercased string, in a single search.
+# Alternations of literals are searched in C, which is faster than a Python loop of substring checks.
+invalid_url_contents_regex = re.compile("|".join(map(re.escape, invalid_url_contents)))
+feed_link_types_regex = re.compile("|".join(map(re.escape, feed_link_types)))
+# Dates in urls generally indicate an article page, so are matched with the low priority strings.
+low_priority_regex = re.compile(
+    "|".join([*map(re.escape, low_priority_urls), date_regex.pattern])
+)
 
 
 logger = logging.getLogger(__name__)
 
 
+class UrlMatch:
+    """Bit flags for the patterns matched by a URL pattern scan."""
+
+    FEEDLIKE = 1
+    PODCAST = 2
+    AUTHOR = 4
+    LOW_PRIORITY = 8
+    INVALID_CONTENTS = 16
+
+
+@lru_cache(maxsize=4096)
+def clean_query(url_string: str) -> str:
+    """
+    Remove the querystring and fragment from a URL string.
+    Cached, as the same links are checked on many pages and url_query_cleaner re-parses the URL on every call.
+
+    :param url_string: URL as string
+    :return: URL string without querystring
+    """
+    return url_query_cleaner(url_string)
+
+
+def create_url_pattern_database():
+    """
+    Compile the URL patterns into a single Hyperscan database, so that all patterns are matched
+    in one pass over the URL string.
+
+    :return: Hyperscan Database, or None if Hyperscan is not installed.
+    """
+    if not hyperscan:
+        return None
+
+    patterns = [
+        (FEEDLIKE_PATTERN, UrlMatch.FEEDLIKE),
+        (PODCAST_PATTERN, UrlMatch.PODCAST),
+        (AUTHOR_PATTERN, UrlMatch.AUTHOR),
+        (low_priority_regex.pattern, UrlMatch.LOW_PRIORITY),
+        (invalid_url_contents_regex.pattern, UrlMatch.INVALID_CONTENTS),
+    ]
+    # Single match mode is not used, as a batch scan needs every match across all hrefs.
+    flags = hyperscan.HS_FLAG_CASELESS
+
+    try:
+        database = hyperscan.Database()
+        database.compile(
+            expressions=[pattern.encode() for pattern, _ in patterns],
+            ids=[match for _, match in patterns],
+            flags=[flags] * len(patterns),
+            elements=len(patterns),
+        )
+        return database
+    except Exception as e:
+        logger.warning("Failed to compile Hyperscan database: %s", e)
+        return None
+
+
+url_pattern_database = create_url_pattern_database()
+
+# Hyperscan scratch space can only be used by one scan at a time, so each thread has its own.
+_url_pattern_scratch = threading.local()
+
+
+def get_url_pattern_scratch():
+    """
+    Get the Hyperscan scratch space for the URL pattern database in the current thread.
+
+    :return: Hyperscan Scratch
+    """
+    scratch = getattr(_url_pattern_scratch, "scratch", None)
+    if scratch is None:
+        scratch = hyperscan.Scratch(url_pattern_database)
+        _url_pattern_scratch.scratch = scratch
+    return scratch
+
+
+def scan_url_patterns(href: str) -> Optional[int]:
+    """
+    Match all URL patterns against the href in a single pass.
+    Feedlike, podcast, and author patterns only match before the querystring or fragment.
+
+    :param href: URL string
+    :return: UrlMatch bit flags of the matched patterns, or None if the scan failed
+    """
+    matches = scan_url_patterns_batch([href])
+    return matches[0] if matches else None
+
+
+def scan_url_patterns_batch(hrefs: List[str]) -> Optional[List[int]]:
+    """
+    Match all URL patterns against a list of hrefs in a single Hyperscan scan.
+    The hrefs are joined with newlines, which none of the patterns can match across,
+    and each match is assigned to an href by its end offset.
+
+    :param hrefs: List of URL strings
+    :return: List of UrlMatch bit flags of the matched patterns, in the same order as hrefs,
+        or None if the scan failed
+    """
+    encoded = [href.encode("utf-8", "surrogateescape") for href in hrefs]
+
+    # Start offset and path end offset of each href in the joined buffer.
+    starts: List[int] = []
+    path_ends: List[int] = []
+    offset = 0
+    for data in encoded:
+        path_end = len(data)
+        for char in (b"?", b"#"):
+            index = data.find(char, 0, path_end)
+            if index > -1:
+                path_end = index
+        starts.append(offset)
+        path_ends.append(offset + path_end)
+        offset += len(data) + 1
+
+    matches = [0] * len(hrefs)
+    path_matches = UrlMatch.FEEDLIKE | UrlMatch.PODCAST | UrlMatch.AUTHOR
+
+    # noinspection PyUnusedLocal
+    def on_match(match_id, start, end, flags, context):
+        index = bisect_right(starts, end - 1) - 1
+        if match_id & path_matches and end > path_ends[index]:
+            return
+        matches[index] |= match_id
+
+    try:
+        url_pattern_database.scan(
+            b"\n".join(encoded),
+            match_event_handler=on_match,
+            scratch=get_url_pattern_scratch(),
+        )
+    except hyperscan.error as e:
+        logger.warning("Hyperscan scan failed: %s", e)
+        return None
+    return matches
+
+
 class LinkFilter:
     def __init__(self, response: Response, request: Request, full_crawl: bool = False):
         self.response = response
@@ -84,31 +254,107 @@ class LinkFilter:
         href: str = link.get("href")
         link_type: str = link.get("type")
 
-        url: URL = parse_href_to_url(href)
-        if not url:
+        return self._classify_href(href, link_type, self.full_crawl)
+
+    def should_follow_links(self, links: List[Any]) -> List[Optional[Tuple[URL, int]]]:
+        """
+        Check a list of links, matching the patterns of all link hrefs in one batch if Hyperscan is available.
+
+        :param links: List of link tags, or of link attributes with a get() method
+        :return: List of URL and priority tuples, or None for links that should not be followed
+        """
+        hrefs: List[str] = [link.get("href") or "" for link in links]
+        all_matches = None
+        if url_pattern_database:
+            all_matches = scan_url_patterns_batch(hrefs)
+        # Fall back to the per-href regex checks if Hyperscan isn't available or the scan failed.
+        if all_matches is None:
+            all_matches = [None] * len(hrefs)
+
+        return [
+            self._classify_href(href, link.get("type"), self.full_crawl, matches)
+            for href, link, matches in zip(hrefs, links, all_matches)
+        ]
+
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _classify_href(
+        href: str, link_type: str, full_crawl: bool, matches: Optional[int] = None
+    ) -> Optional[Tuple[URL, int]]:
+        """
+        Classify a link href and return the URL and queue priority if it should be followed.
+        The result only depends on the arguments, so it is cached as the same links appear on many pages.
+
+        :param href: Link href string
+        :param link_type: Link type attribute
+        :param full_crawl: Follow all valid links, not only feedlike links
+        :param matches: UrlMatch bit flags of the href if already scanned
+        :return: Tuple of URL and priority, or None
+        """
+        # Links to fragments or to non-HTTP schemes can never be crawled.
+        if not href or href[:11].lower().startswith(unfollowable_href_prefixes):
             return None
 
         # If the link may have a valid feed type then follow it regardless of the url text.
+        link_type = link_type.lower() if link_type else ""
         if (
             link_type
-            and any(map(link_type.lower().count, feed_link_types))
             and "json+oembed" not in link_type
+            and feed_link_types_regex.search(link_type)
         ):
+            url: URL = parse_href_to_url(href)
+            if not url:
+                return None
             # A link with a possible feed type has the highest priority after callbacks.
             return url, 2
 
-        is_feedlike_href: bool = self.is_href_matching(str(url), feedlike_regex)
-        is_feedlike_querystring: bool = self.is_querystring_matching(
+        # Match all href patterns in one pass if Hyperscan is available.
+        if matches is None and url_pattern_database:
+            matches = scan_url_patterns(href)
+
+        # Reject invalid hrefs with string checks before parsing the URL.
+        if matches is not None:
+            has_invalid_contents = bool(matches & UrlMatch.INVALID_CONTENTS)
+        else:
+            # Lowercase the href once for all of the substring checks.
+            href_lower = href.lower()
+            has_invalid_contents = LinkFilter._has_invalid_contents_lower(href_lower)
+        if has_invalid_contents or not LinkFilter.is_valid_filetype(href):
+            return None
+
+        if matches is not None:
+            is_feedlike_href = bool(matches & UrlMatch.FEEDLIKE)
+            is_podcast_href = bool(matches & UrlMatch.PODCAST)
+        else:
+            # Remove the querystring and fragment once for all of the href pattern checks,
+            # in the same way as the Hyperscan patterns are only matched before them.
+            url_path = href_lower.partition("?")[0].partition("#")[0]
+            # Most paths match neither, so check for both at once before checking each.
+            if feedlike_or_podcast_lower_regex.search(url_path):
+                is_feedlike_href = bool(feedlike_lower_regex.search(url_path))
+                is_podcast_href = bool(podcast_lower_regex.search(url_path))
+            else:
+                is_feedlike_href = is_podcast_href = False
+
+        # Most links on a page are not feedlike, and without a querystring can be rejected before parsing the URL.
+        if not (full_crawl or is_feedlike_href or is_podcast_href or "?" in href):
+            return None
+
+        url: URL = parse_href_to_url(href)
+        if not url:
+            return None
+
+        is_feedlike_querystring: bool = LinkFilter.is_querystring_matching(
             url, feedlike_regex
         )
-
-        is_podcast_href: bool = self.is_href_matching(str(url), podcast_regex)
-        is_podcast_querystring: bool = self.is_querystring_matching(url, podcast_regex)
+        is_podcast_querystring: bool = LinkFilter.is_querystring_matching(
+            url, podcast_regex
+        )
 
         is_feedlike_url = is_feedlike_querystring or is_feedlike_href
         is_podcast_url = is_podcast_href or is_podcast_querystring
 
-        if not self.full_crawl and not is_feedlike_url and not is_podcast_url:
+        if not full_crawl and not is_feedlike_url and not is_podcast_url:
             return
 
         # This check is deprecated, as it has been moved to the spider to prevent the crawling of any links
@@ -118,8 +364,12 @@ class LinkFilter:
         # if not is_one_jump:
         #     return
 
-        has_author_info: bool = self.is_href_matching(href, author_regex)
-        is_low_priority: bool = self.is_low_priority(href)
+        if matches is not None:
+            has_author_info = bool(matches & UrlMatch.AUTHOR)
+            is_low_priority = bool(matches & UrlMatch.LOW_PRIORITY)
+        else:
+            has_author_info = bool(author_lower_regex.search(url_path))
+            is_low_priority = LinkFilter._is_low_priority_lower(href_lower)
 
         priority: int = Request.priority
         # A low priority url should be fetched last.
@@ -135,16 +385,11 @@ class LinkFilter:
         if is_feedlike_url:
             priority = 3
 
-        # Validate the actual URL string.
-        follow = (
-            # is_one_jump
-            not self.has_invalid_contents(href)
-            and self.is_valid_filetype(href)
-            and not self.has_invalid_querystring(url)
-        )
+        # Validate the actual URL. The href string was already validated before parsing.
+        follow = not LinkFilter.has_invalid_querystring(url)
         # If full_crawl then follow all valid URLs regardless of the feedlike quality of the URL.
         # Otherwise only follow URLs if they look like they might contain feed information.
-        if follow and (self.full_crawl or is_feedlike_url or is_podcast_href):
+        if follow and (full_crawl or is_feedlike_url or is_podcast_href):
 
             # Remove the querystring unless it may point to a feed.
             if not is_feedlike_querystring:
@@ -152,6 +397,14 @@ class LinkFilter:
 
             return url, priority
 
+    @staticmethod
+    def cache_clear() -> None:
+        """
+        Clear the cached link classifications and cleaned URLs.
+        """
+        LinkFilter._classify_href.cache_clear()
+        clean_query.cache_clear()
+
     @staticmethod
     def is_one_jump_from_original_domain(url: URL, response: Response) -> bool:
         """
@@ -175,30 +428,23 @@ class LinkFilter:
         :return: boolean
         """
 
+        history = response.history
+
         # This is the first Response in the chain
-        if len(response.history) < 2:
+        if len(history) < 2:
             return True
 
         # The URL is relative, so on the same domain
         if not url.is_absolute():
             return True
 
-        # URL is same domain
-        if url.host == response.history[0].host:
-            return True
-
-        # URL is sub-domain
-        if response.history[0].host in url.host:
+        # URL is same domain or sub-domain
+        original_host = history[0].host
+        if original_host in url.host:
             return True
 
         # URL domain and current Response domain are different from original domain
-        if (
-            response.history[-1].host != response.history[0].host
-            and url.host != response.history[0].host
-        ):
-            return False
-
-        return True
+        return history[-1].host == original_host
 
     @staticmethod
     def is_valid_filetype(url: str) -> bool:
@@ -208,13 +454,15 @@ class LinkFilter:
         :param url: URL string
         :return: boolean
         """
-        # if file_regex.search(url.strip()):
-        #     return False
-        # return True
-        suffix = pathlib.Path(url_query_cleaner(url)).suffix.strip(".").lower()
-        if suffix in invalid_filetypes:
-            return False
-        return True
+        # Remove the querystring and fragment, and find the last path segment.
+        path = url.partition("?")[0].partition("#")[0].rstrip("/")
+        name = path[path.rfind("/") + 1 :]
+
+        # Names without a dot, or starting with a dot, have no file extension.
+        dot = name.rfind(".")
+        if dot < 1:
+            return True
+        return name[dot + 1 :].lower() not in invalid_filetypes
 
     @staticmethod
     def has_invalid_querystring(url: URL) -> bool:
@@ -224,7 +472,7 @@ class LinkFilter:
         :param url: URL object
         :return: boolean
         """
-        return any(key in url.query for key in invalid_querystring_keys)
+        return not invalid_querystring_keys.isdisjoint(url.query)
 
     @staticmethod
     def is_href_matching(url_string: str, regex: re) -> bool:
@@ -235,7 +483,7 @@ class LinkFilter:
         :param regex: Regex used to search URL
         :return: boolean
         """
-        if regex.search(url_query_cleaner(url_string)):
+        if regex.search(clean_query(url_string)):
             return True
         return False
 
@@ -261,7 +509,17 @@ class LinkFilter:
         :param string: String to check
         :return: boolean
         """
-        return any(value in string.lower() for value in invalid_url_contents)
+        return LinkFilter._has_invalid_contents_lower(string.lower())
+
+    @staticmethod
+    def _has_invalid_contents_lower(string_lower: str) -> bool:
+        """
+        Check an already lowercased string for invalid contents.
+
+        :param string_lower: Lowercased string to check
+        :return: boolean
+        """
+        return bool(invalid_url_contents_regex.search(string_lower))
 
     @staticmethod
     def is_low_priority(url_string: str) -> bool:
@@ -271,13 +529,17 @@ class LinkFilter:
         :param url_string: URL string
         :return: boolean
         """
-        if any(value in url_string.lower() for value in low_priority_urls):
-            return True
+        return LinkFilter._is_low_priority_lower(url_string.lower())
 
-        # Search for dates in url, this generally indicates an article page.
-        if date_regex.search(url_string):
-            return True
-        return False
+    @staticmethod
+    def _is_low_priority_lower(url_lower: str) -> bool:
+        """
+        Check an already lowercased url string for low priority contents.
+
+        :param url_lower: Lowercased URL string
+        :return: boolean
+        """
+        return bool(low_priority_regex.search(url_lower))
 
     @staticmethod
     def is_subdomain_matching(url: URL, regex: re) -> bool:
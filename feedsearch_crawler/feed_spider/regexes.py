@@ -1,25 +1,44 @@
-import re
+try:
+    # RE2 guarantees linear time matching, and is faster for these simple patterns.
+    # Flags are set inline with (?i) as RE2 does not accept the stdlib re flags.
+    import re2 as re
+except ImportError:
+    import re
+
+import re as std_re
+
+# Words that indicate a URL may be a feed or a podcast.
+FEEDLIKE_WORDS = "rss|feeds?|atom|json|xml|rdf|blogs?|subscribe"
+PODCAST_WORDS = "podcasts?"
+
+# Pattern to check that a feed-like string is a whole word to help rule out false positives.
+FEEDLIKE_PATTERN = f"\\b({FEEDLIKE_WORDS})\\b"
+# Pattern to check that a podcast string is a whole word.
+PODCAST_PATTERN = f"\\b({PODCAST_WORDS})\\b"
+# Pattern to check if the URL might contain author information.
+AUTHOR_PATTERN = "(authors?|journalists?|writers?|contributors?)"
 
 # Regex to check if possible RSS data.
-rss_regex = re.compile("(<rss|<rdf|<feed)", re.IGNORECASE)
+rss_regex = re.compile("(?i)(<rss|<rdf|<feed)")
 
 # Regex to check that a feed-like string is a whole word to help rule out false positives.
-feedlike_regex = re.compile(
-    "\\b(rss|feeds?|atom|json|xml|rdf|blogs?|subscribe)\\b", re.IGNORECASE
-)
+feedlike_regex = re.compile("(?i)" + FEEDLIKE_PATTERN)
 
 # Regex to check that a podcast string is a whole word.
-podcast_regex = re.compile("\\b(podcasts?)\\b", re.IGNORECASE)
+podcast_regex = re.compile("(?i)" + PODCAST_PATTERN)
 
 # Regex to check if the URL might contain author information.
-author_regex = re.compile(
-    "(authors?|journalists?|writers?|contributors?)", re.IGNORECASE
-)
+author_regex = re.compile("(?i)" + AUTHOR_PATTERN)
 
-# Regex to check URL string for invalid file types.
-file_regex = re.compile(
-    ".(jpe?g|png|gif|bmp|mp4|mp3|mkv|md|css|avi|pdf|js|woff2?|svg|ttf|zip)/?$",
-    re.IGNORECASE,
+# Case-sensitive versions of the URL regexes, for strings that are already lowercase.
+# Always compiled with the stdlib re module, where skipping case folding makes each search
+# faster than RE2 for these short strings.
+feedlike_lower_regex = std_re.compile(FEEDLIKE_PATTERN)
+podcast_lower_regex = std_re.compile(PODCAST_PATTERN)
+author_lower_regex = std_re.compile(AUTHOR_PATTERN)
+# Matches either a feed-like or a podcast word, to reject most URLs with a single search.
+feedlike_or_podcast_lower_regex = std_re.compile(
+    f"\\b({FEEDLIKE_WORDS}|{PODCAST_WORDS})\\b"
 )
 
 # Regex to match year and month in URLs, e.g. /2019/07/
@@ -6,15 +6,24 @@ from feedsearch_crawler.crawler import Item
 
 
 class SiteMeta(Item):
-    url: URL = None
-    site_url: str = ""
-    site_name: str = ""
-    icon_url: URL = None
-    icon_data_uri: str = ""
-    possible_icons: List = []
-    host: str = ""
+    __slots__ = (
+        "url",
+        "site_url",
+        "site_name",
+        "icon_url",
+        "icon_data_uri",
+        "possible_icons",
+        "host",
+    )
 
     def __init__(self, url: URL, **kwargs) -> None:
+        self.url: URL = None
+        self.site_url: str = ""
+        self.site_name: str = ""
+        self.icon_url: URL = None
+        self.icon_data_uri: str = ""
+        self.possible_icons: List = []
+        self.host: str = ""
         super().__init__(**kwargs)
         self.url = url
 
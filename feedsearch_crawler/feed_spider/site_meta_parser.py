@@ -1,4 +1,5 @@
 import logging
+from operator import attrgetter
 from typing import List
 
 from yarl import URL
@@ -65,7 +66,7 @@ class SiteMetaParser(ItemParser):
             if icon.url:
                 possible_icons.append(icon)
 
-        return sorted(possible_icons, key=lambda x: x.priority)
+        return sorted(possible_icons, key=attrgetter("priority"))
 
     @staticmethod
     def find_site_url(soup, url: URL) -> URL:
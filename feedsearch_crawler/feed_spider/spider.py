@@ -1,41 +1,114 @@
+import asyncio
 import base64
+from collections import defaultdict
+from itertools import chain
 import logging
 from types import AsyncGeneratorType
-from typing import Union, Any, List, Set
+from typing import Union, Any, List, Set, Dict, FrozenSet, Tuple, Optional, Callable
 
 import bs4
+from aiohttp import hdrs
 from yarl import URL
 
 from feedsearch_crawler.crawler import Crawler, Item, Request, Response
-from feedsearch_crawler.crawler.lib import parse_href_to_url
+from feedsearch_crawler.crawler.lib import parse_href_to_url, host_suffixes
 from feedsearch_crawler.feed_spider.dupefilter import NoQueryDupeFilter
 from feedsearch_crawler.feed_spider.favicon import Favicon
 from feedsearch_crawler.feed_spider.feed_info import FeedInfo
 from feedsearch_crawler.feed_spider.feed_info_parser import FeedInfoParser
-from feedsearch_crawler.feed_spider.lib import ParseTypes
+from feedsearch_crawler.feed_spider.lib import (
+    ParseTypes,
+    is_parseable_content_type,
+    is_xml_feed_content_type,
+    is_json_feed,
+    get_image_mimetype,
+)
 from feedsearch_crawler.feed_spider.link_filter import LinkFilter
 from feedsearch_crawler.feed_spider.regexes import rss_regex
 from feedsearch_crawler.feed_spider.site_meta import SiteMeta
 from feedsearch_crawler.feed_spider.site_meta_parser import SiteMetaParser
 
+try:
+    import lxml  # noqa: F401
+
+    DEFAULT_HTML_PARSER = "lxml"
+except ImportError:
+    DEFAULT_HTML_PARSER = "html.parser"
+
+try:
+    # Lexbor is much faster than BeautifulSoup at finding links on large pages.
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+
+# Only the tags used for links and site metadata are built when parsing HTML.
+html_parse_only = bs4.SoupStrainer(["a", "area", "link", "meta", "title"])
+
+# Images larger than this many bytes are base64 encoded in a thread instead of on the event loop.
+# Most favicons are smaller, and are quicker to encode than to hand off to a thread.
+EXECUTOR_ENCODE_MIN_SIZE = 64 * 1024
+
+# Common paths for feeds.
+feed_suffixes: FrozenSet[str] = frozenset(
+    {
+        "index.xml",
+        "atom.xml",
+        "feeds",
+        "feeds/default",
+        "feed",
+        "feed/default",
+        "feeds/posts/default",
+        "?feed=rss",
+        "?feed=atom",
+        "?feed=rss2",
+        "?feed=rdf",
+        "rss",
+        "atom",
+        "rdf",
+        "index.rss",
+        "index.rdf",
+        "index.atom",
+        "data/rss",
+        "rss.xml",
+        "index.json",
+        "about",
+        "about/feeds",
+        "rss-feeds",
+    }
+)
+
+# Common paths for feeds as relative URLs, to be joined to each origin URL.
+feed_suffix_urls: Tuple[URL, ...] = tuple(URL(suffix) for suffix in feed_suffixes)
+
+
 logger = logging.getLogger(__name__)
 
 
 class FeedsearchSpider(Crawler):
     duplicate_filter_class = NoQueryDupeFilter
-    htmlparser = "html.parser"
+    # BeautifulSoup parser. Uses lxml if it is installed, as it is much faster than html.parser.
+    htmlparser = DEFAULT_HTML_PARSER
     favicon_data_uri = True
     try_urls: Union[List[str], bool] = False
     full_crawl: bool = False
     crawl_hosts: bool = True
+    # Optional function called with each new FeedInfo as soon as it is found.
+    feed_callback: Optional[Callable[[FeedInfo], None]] = None
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.site_meta_processor = SiteMetaParser(self)
         self.feed_info_parser = FeedInfoParser(self)
-        self.site_metas = set()
+        # Parsed FeedInfo and SiteMeta items, keyed on URL string.
+        self.items: Dict[str, FeedInfo] = dict()
+        self.site_metas: Dict[str, SiteMeta] = dict()
         self.favicons = dict()
-        self.feeds_seen = dict()
+        # SiteMeta and Favicon items indexed by host, for lookup by feed host.
+        self._site_metas_by_host: Dict[str, SiteMeta] = dict()
+        self._favicons_by_host: Dict[str, Dict[URL, Favicon]] = defaultdict(dict)
+        # The start URL of the request chain in which each feed was found, keyed on feed URL string.
+        self.feed_start_urls: Dict[str, URL] = dict()
         self.post_crawl_callback = self.populate_feed_site_meta
         if "try_urls" in kwargs:
             self.try_urls = kwargs["try_urls"]
@@ -45,6 +118,10 @@ class FeedsearchSpider(Crawler):
             self.full_crawl = kwargs["full_crawl"]
         if "crawl_hosts" in kwargs:
             self.crawl_hosts = kwargs["crawl_hosts"]
+        if "htmlparser" in kwargs:
+            self.htmlparser = kwargs["htmlparser"]
+        if "feed_callback" in kwargs:
+            self.feed_callback = kwargs["feed_callback"]
 
     async def parse(self, request: Request, response: Response) -> AsyncGeneratorType:
         """
@@ -59,13 +136,16 @@ class FeedsearchSpider(Crawler):
         if not response.ok:
             return
 
+        # Don't parse binary content such as images or PDFs.
+        content_type = response.headers.get(hdrs.CONTENT_TYPE, "")
+        if not is_parseable_content_type(content_type):
+            logger.debug("Content-Type '%s' not parseable: %s", content_type, response)
+            return
+
         # If the Response contains JSON then attempt to parse it as a JsonFeed.
-        if response.json:
-            if "version" and "jsonfeed" and "feed_url" in response.json:
-                yield self.feed_info_parser.parse_item(
-                    request, response, parse_type=ParseTypes.JSON
-                )
-                return
+        if is_json_feed(response.json):
+            yield self.parse_feed(request, response, ParseTypes.JSON)
+            return
 
         if not isinstance(response.text, str):
             logger.debug("No text in %s", response)
@@ -73,11 +153,12 @@ class FeedsearchSpider(Crawler):
 
         yield self.parse_site_meta(request, response)
 
+        # Trust a feed Content-Type, otherwise check for RSS data in the Response text.
         # Restrict the RSS check to the first 1000 characters, otherwise it's almost definitely not an actual feed.
-        if rss_regex.search(response.text, endpos=1000):
-            yield self.feed_info_parser.parse_item(
-                request, response, parse_type=ParseTypes.XML
-            )
+        if is_xml_feed_content_type(content_type) or rss_regex.search(
+            response.text, endpos=1000
+        ):
+            yield self.parse_feed(request, response, ParseTypes.XML)
             return
 
         # Don't waste time trying to parse and follow urls if the max depth is already reached.
@@ -85,29 +166,50 @@ class FeedsearchSpider(Crawler):
             logger.debug("Max depth %d reached: %s", self.max_depth, response)
             return
 
-        # Make sure the Response XML has been parsed if it exists.
-        soup = await response.xml
-        if not soup:
-            return
-
         # Don't crawl links from pages that are not from the original domain
         if not response.is_original_domain():
             return
 
+        links = await self.find_links(response)
+        if not links:
+            return
+
         link_filter = LinkFilter(
             request=request, response=response, full_crawl=self.full_crawl
         )
 
-        # Find all links in the Response.
-        links = soup.find_all(self.tag_has_href)
-        for link in links:
-            # Check each href for validity and queue priority.
-            values = link_filter.should_follow_link(link)
-            if values:
-                url, priority = values
-                yield await self.follow(
-                    url, self.parse, response, priority=priority, allow_domain=True
-                )
+        # The same link often appears more than once on a page, so only follow each URL once.
+        followed: Set[URL] = set()
+
+        # Check each link href for validity and queue priority.
+        for values in link_filter.should_follow_links(links):
+            if not values:
+                continue
+            url, priority = values
+            if url in followed:
+                continue
+            followed.add(url)
+            yield await self.follow(
+                url, self.parse, response, priority=priority, allow_domain=True
+            )
+
+    async def parse_feed(
+        self, request: Request, response: Response, parse_type: str
+    ) -> AsyncGeneratorType:
+        """
+        Parses a feed, and records the start URL of the request chain in which it was found.
+
+        :param request: Request
+        :param response: Response
+        :param parse_type: Type of feed data, one of ParseTypes
+        :return: AsyncGenerator yielding FeedInfo items and favicon Requests
+        """
+        async for value in self.feed_info_parser.parse_item(
+            request, response, parse_type=parse_type
+        ):
+            if isinstance(value, FeedInfo):
+                self.feed_start_urls.setdefault(str(value.url), response.history[0])
+            yield value
 
     async def parse_site_meta(
         self, request: Request, response: Response
@@ -122,12 +224,33 @@ class FeedsearchSpider(Crawler):
         :param response: Response
         :return: AsyncGenerator yielding SiteMeta items
         """
-        url_origin = response.url.origin()
-        request_url_origin = request.url.origin()
-
-        if response.url == url_origin or request.url == request_url_origin:
+        # The Response origin is created with the Response, and the Request origin is only created if needed.
+        if response.url == response.origin or request.url == request.url.origin():
             yield self.site_meta_processor.parse_item(request, response)
 
+    async def find_links(self, response: Response) -> List[Any]:
+        """
+        Find all elements with an href attribute in the Response.
+        Uses the selectolax Lexbor parser if it is installed, unless html.parser has been chosen,
+        otherwise searches the BeautifulSoup tree of the Response.
+
+        :param response: Response
+        :return: List of link tags or link attributes, which both support get() of attribute values
+        """
+        if LexborHTMLParser and self.htmlparser != "html.parser":
+            try:
+                tree = LexborHTMLParser(response.text)
+                return [node.attrs for node in tree.css("[href]")]
+            except Exception as e:
+                logger.warning("Error finding links in %s: %s", response, e)
+                return []
+
+        # Make sure the Response XML has been parsed if it exists.
+        soup = await response.xml
+        if not soup:
+            return []
+        return soup.find_all(href=True)
+
     async def parse_xml(self, response_text: str) -> Any:
         """
         Parse Response text as XML.
@@ -136,7 +259,9 @@ class FeedsearchSpider(Crawler):
         :param response_text: Response text as string.
         :return: None
         """
-        return bs4.BeautifulSoup(response_text, self.htmlparser)
+        return bs4.BeautifulSoup(
+            response_text, self.htmlparser, parse_only=html_parse_only
+        )
 
     async def process_item(self, item: Item) -> None:
         """
@@ -146,9 +271,15 @@ class FeedsearchSpider(Crawler):
         :return: None
         """
         if isinstance(item, FeedInfo):
-            self.items.add(item)
+            if (
+                self.items.setdefault(str(item.url), item) is item
+                and self.feed_callback
+            ):
+                self.feed_callback(item)
         elif isinstance(item, SiteMeta):
-            self.site_metas.add(item)
+            self.site_metas.setdefault(str(item.url), item)
+            if item.host:
+                self._site_metas_by_host.setdefault(item.host, item)
         elif isinstance(item, Favicon):
             self.add_favicon(item)
 
@@ -162,16 +293,24 @@ class FeedsearchSpider(Crawler):
         if existing and existing.data_uri and not favicon.data_uri:
             return
         self.favicons[favicon.url] = favicon
+        if favicon.site_host:
+            self._favicons_by_host[favicon.site_host][favicon.url] = favicon
 
     # noinspection PyPep8
     async def populate_feed_site_meta(self) -> None:
         """
         Populate FeedInfo site information with data from the relevant SiteMeta item
         """
-        for feed in self.items:
-            # Check each SiteMeta for a url host match
+        for feed in self.items.values():
+            # Find the SiteMeta with the most specific host match.
+            feed_hosts = host_suffixes(feed.url.host)
             site_meta = next(
-                (x for x in self.site_metas if x.host in feed.url.host), None
+                (
+                    self._site_metas_by_host[host]
+                    for host in feed_hosts
+                    if host in self._site_metas_by_host
+                ),
+                None,
             )
             if site_meta:
                 feed.site_url = site_meta.url
@@ -189,15 +328,16 @@ class FeedsearchSpider(Crawler):
                 self.favicon_data_uri and not feed.favicon_data_uri
             ):
                 feed_host = feed.url.host
-                favicons = list(
-                    x
-                    for x in self.favicons.values()
-                    if x.matches_host(feed_host, self.favicon_data_uri)
-                )
-
-                if favicons:
-                    favicon = min(favicons, key=lambda x: x.priority)
+                # Find the matching favicon with the best priority in a single pass.
+                favicon = None
+                for host in feed_hosts:
+                    for x in self._favicons_by_host.get(host, {}).values():
+                        if not x.matches_host(feed_host, self.favicon_data_uri):
+                            continue
+                        if favicon is None or x.priority < favicon.priority:
+                            favicon = x
 
+                if favicon:
                     feed.favicon_data_uri = favicon.data_uri
                     feed.favicon = favicon.resp_url if favicon.resp_url else favicon.url
 
@@ -216,22 +356,23 @@ class FeedsearchSpider(Crawler):
         if not response.ok or not response.data or not isinstance(response.data, bytes):
             return
 
-        def is_png(data: bytes) -> bool:
-            return data[:8] in bytes.fromhex("89 50 4E 47 0D 0A 1A 0A")
-
-        def is_ico(data: bytes) -> bool:
-            return data[:4] in bytes.fromhex("00 00 01 00")
-
-        try:
-            if not is_png(response.data) and not is_ico(response.data):
-                logger.debug("Response data is not a valid image type: %s", response)
-                return
-        except Exception as e:
-            logger.exception("Failure validation image type: %s: %s", response, e)
+        mimetype = get_image_mimetype(response.data)
+        if not mimetype:
+            logger.debug("Response data is not a valid image type: %s", response)
+            return
 
         try:
-            encoded = base64.b64encode(response.data)
-            uri = "data:image/png;base64," + encoded.decode(response.encoding)
+            # Encode large images in a thread, so that the event loop can keep sending requests.
+            if len(response.data) > EXECUTOR_ENCODE_MIN_SIZE:
+                loop = asyncio.get_running_loop()
+                encoded = await loop.run_in_executor(
+                    None, base64.b64encode, response.data
+                )
+            else:
+                encoded = base64.b64encode(response.data)
+            # Build the data uri as bytes and decode once. Base64 output is always ASCII.
+            uri = b"".join((b"data:", mimetype.encode(), b";base64,", encoded))
+            uri = uri.decode("ascii")
             favicon.resp_url = response.url
             favicon.data_uri = uri
             self.add_favicon(favicon)
@@ -244,73 +385,42 @@ class FeedsearchSpider(Crawler):
 
         :param urls: Initial URLs
         """
-        crawl_start_urls: Set[URL] = set()
+        # Start URLs are keyed by their string without a trailing slash, so that e.g. "https://test.com"
+        # and "https://test.com/" are only crawled once. yarl has already lowercased the scheme and host.
+        crawl_start_urls: Dict[str, URL] = {}
+
+        def add_start_url(start_url: URL) -> None:
+            crawl_start_urls.setdefault(str(start_url).rstrip("/"), start_url)
 
-        for url in urls + self.start_urls:
+        for url in chain(urls, self.start_urls):
             if isinstance(url, str):
-                if "//" not in url:
-                    url = f"//{url}"
-                url = parse_href_to_url(url)
+                # Strings without a scheme or // are parsed as hosts rather than paths.
+                url = parse_href_to_url(url if "//" in url else f"//{url}")
                 if not url:
                     continue
 
-            if url.scheme.lower() not in ["http", "https"]:
+            # yarl normalises the scheme to lowercase.
+            if url.scheme not in ("http", "https"):
                 url = url.with_scheme("http")
 
-            crawl_start_urls.add(url)
+            add_start_url(url)
 
-        origins = set(url.origin() for url in crawl_start_urls)
+        origins = set(url.origin() for url in crawl_start_urls.values())
 
         if self.try_urls:
-            # Common paths for feeds.
-            suffixes = {
-                "index.xml",
-                "atom.xml",
-                "feeds",
-                "feeds/default",
-                "feed",
-                "feed/default",
-                "feeds/posts/default",
-                "?feed=rss",
-                "?feed=atom",
-                "?feed=rss2",
-                "?feed=rdf",
-                "rss",
-                "atom",
-                "rdf",
-                "index.rss",
-                "index.rdf",
-                "index.atom",
-                "data/rss",
-                "rss.xml",
-                "index.json",
-                "about",
-                "about/feeds",
-                "rss-feeds",
-            }
+
+            if isinstance(self.try_urls, list):
+                suffix_urls = [URL(suffix) for suffix in self.try_urls]
+            else:
+                suffix_urls = feed_suffix_urls
 
             for origin in origins:
-                if isinstance(self.try_urls, list):
-                    crawl_start_urls.update(
-                        origin.join(URL(suffix)) for suffix in self.try_urls
-                    )
-                else:
-                    crawl_start_urls.update(
-                        origin.join(URL(suffix)) for suffix in suffixes
-                    )
+                for suffix in suffix_urls:
+                    add_start_url(origin.join(suffix))
 
         # Crawl the origin urls of the start urls for Site metadata.
         if self.crawl_hosts:
-            crawl_start_urls.update(origins)
-
-        return list(crawl_start_urls)
-
-    @staticmethod
-    def tag_has_href(tag: bs4.Tag) -> bool:
-        """
-        Find all tags that contain links.
+            for origin in origins:
+                add_start_url(origin)
 
-        :param tag: XML tag
-        :return: boolean
-        """
-        return tag.has_attr("href")
+        return list(crawl_start_urls.values())
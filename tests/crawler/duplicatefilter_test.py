@@ -0,0 +1,16 @@
+import asyncio
+
+from yarl import URL
+
+from feedsearch_crawler.crawler import DuplicateFilter
+
+
+def test_seen_or_add():
+    dupefilter = DuplicateFilter()
+    url = URL("https://example.com/feed")
+
+    assert not dupefilter.seen_or_add(url)
+    assert dupefilter.seen_or_add(url)
+    assert not dupefilter.seen_or_add(url, "POST")
+    assert asyncio.run(dupefilter.url_seen(url, "POST"))
+    assert len(dupefilter.fingerprints) == 2
@@ -1,4 +1,10 @@
-from feedsearch_crawler.crawler.lib import coerce_url, is_same_domain
+from feedsearch_crawler.crawler.lib import (
+    coerce_url,
+    is_same_domain,
+    host_suffixes,
+    CrawlerPriorityQueue,
+    CallbackResult,
+)
 from yarl import URL
 
 
@@ -31,3 +37,31 @@ def test_is_same_domain():
     assert is_same_domain("www.test.com", "test.com") is True
     assert is_same_domain("www.test.com", "feed.test.com") is True
     assert is_same_domain("test.www.test.com", "test.com") is False
+
+
+def test_host_suffixes():
+    assert host_suffixes("feeds.test.com") == ["feeds.test.com", "test.com", "com"]
+    assert host_suffixes("test.com") == ["test.com", "com"]
+    assert host_suffixes("localhost") == ["localhost"]
+    assert host_suffixes("") == []
+    assert host_suffixes(None) == []
+
+
+def test_crawler_priority_queue():
+    queue = CrawlerPriorityQueue()
+    first = CallbackResult("first", 0)
+    second = CallbackResult("second", 0)
+    low = CallbackResult("low", 0)
+    low.priority = 10
+
+    for queueable in [low, first, second]:
+        queueable.add_to_queue(queue)
+
+    assert queue.qsize() == 3
+    assert queue.get_nowait() is first
+    assert queue.get_nowait() is second
+    assert queue.get_nowait() is low
+
+    low.add_to_queue(queue)
+    queue.clear()
+    assert queue.empty()
@@ -0,0 +1,56 @@
+from feedsearch_crawler.feed_spider.lib import (
+    is_parseable_content_type,
+    is_xml_feed_content_type,
+    is_json_feed,
+    get_image_mimetype,
+)
+
+
+def test_is_parseable_content_type():
+    assert is_parseable_content_type("") is True
+    assert is_parseable_content_type("text/html; charset=utf-8") is True
+    assert is_parseable_content_type("text/xml") is True
+    assert is_parseable_content_type("application/rss+xml") is True
+    assert is_parseable_content_type("application/atom+xml") is True
+    assert is_parseable_content_type("application/feed+json") is True
+    assert is_parseable_content_type("Application/JSON") is True
+
+
+def test_is_parseable_content_type_invalid():
+    assert is_parseable_content_type("image/png") is False
+    assert is_parseable_content_type("application/pdf") is False
+    assert is_parseable_content_type("application/octet-stream") is False
+
+
+def test_is_xml_feed_content_type():
+    assert is_xml_feed_content_type("application/rss+xml") is True
+    assert is_xml_feed_content_type("Application/Atom+XML; charset=utf-8") is True
+    assert is_xml_feed_content_type("text/xml") is False
+    assert is_xml_feed_content_type("application/xhtml+xml") is False
+    assert is_xml_feed_content_type("") is False
+
+
+def test_is_json_feed():
+    assert is_json_feed({"version": "https://jsonfeed.org/version/1", "items": []})
+    assert is_json_feed({"version": "https://jsonfeed.org/version/1.1"})
+    assert not is_json_feed({"feed_url": "https://test.com/feed.json"})
+    assert not is_json_feed({"version": "1.0", "feed_url": "test"})
+    assert not is_json_feed({"version": 1})
+    assert not is_json_feed(["version", "feed_url"])
+    assert not is_json_feed(None)
+
+
+def test_get_image_mimetype():
+    assert get_image_mimetype(b"\x89PNG\r\n\x1a\n\x00\x00") == "image/png"
+    assert get_image_mimetype(b"\x00\x00\x01\x00\x01\x00") == "image/x-icon"
+    assert get_image_mimetype(b"\xff\xd8\xff\xe0\x00\x10JFIF") == "image/jpeg"
+    assert get_image_mimetype(b"\x89PN") == ""
+    assert get_image_mimetype(b"<html></html>") == ""
+    assert (
+        get_image_mimetype(
+            b"<!DOCTYPE html><html><body><svg></svg><h1>Not Found</h1></body></html>"
+        )
+        == ""
+    )
+    assert get_image_mimetype(b'<svg xmlns="http://www.w3.org/2000/svg"/>') == ""
+    assert get_image_mimetype(b"") == ""
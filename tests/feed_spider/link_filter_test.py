@@ -1,7 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 from yarl import URL
 
 from feedsearch_crawler.feed_spider.link_filter import (
     LinkFilter as lf,
+    UrlMatch,
+    scan_url_patterns,
+    scan_url_patterns_batch,
 )
 from feedsearch_crawler.feed_spider.regexes import feedlike_regex, podcast_regex
 
@@ -35,7 +41,7 @@ def test_feedlike_regex():
         "rdf",
         "blog",
         "blogs",
-        "test/subscribe/testing"
+        "test/subscribe/testing",
     ]
     for value in valid:
         assert feedlike_regex.search(value)
@@ -111,3 +117,67 @@ def test_is_podcast_querystring():
     assert (
         lf.is_querystring_matching(URL("test.com?podcasts=test"), podcast_regex) is True
     )
+
+
+def test_scan_url_patterns():
+    pytest.importorskip("hyperscan")
+
+    assert scan_url_patterns("test.com/feed") == UrlMatch.FEEDLIKE
+    assert scan_url_patterns("test.com/podcasts") == UrlMatch.PODCAST
+    assert scan_url_patterns("test.com/authors/test") == UrlMatch.AUTHOR
+    assert scan_url_patterns("test.com/2019/07/test") == UrlMatch.LOW_PRIORITY
+    assert scan_url_patterns("test.com/wp-content/test") == UrlMatch.INVALID_CONTENTS
+    assert scan_url_patterns("test.com/test?feed") == 0
+    assert scan_url_patterns("test.com/test?author=test") == 0
+    assert scan_url_patterns("test.com/test?page=/page/") == UrlMatch.LOW_PRIORITY
+    assert scan_url_patterns("test.com/page/RSS") == (
+        UrlMatch.FEEDLIKE | UrlMatch.LOW_PRIORITY
+    )
+
+
+def test_scan_url_patterns_batch():
+    pytest.importorskip("hyperscan")
+
+    hrefs = ["test.com/feed", "test.com/test?feed", "", "test.com/2019/07/author"]
+    assert scan_url_patterns_batch(hrefs) == [
+        UrlMatch.FEEDLIKE,
+        0,
+        0,
+        UrlMatch.LOW_PRIORITY | UrlMatch.AUTHOR,
+    ]
+
+
+def test_scan_url_patterns_batch_threads():
+    pytest.importorskip("hyperscan")
+
+    hrefs = [f"test.com/{i}/feed" for i in range(1000)]
+    expected = [UrlMatch.FEEDLIKE] * len(hrefs)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(scan_url_patterns_batch, [hrefs] * 32))
+
+    assert all(result == expected for result in results)
+
+
+def test_is_valid_filetype():
+    assert lf.is_valid_filetype("test.com/feed") is True
+    assert lf.is_valid_filetype("test.com/feed.xml") is True
+    assert lf.is_valid_filetype("test.com/.png") is True
+    assert lf.is_valid_filetype("test.com/test.png/feed") is True
+    assert lf.is_valid_filetype("test.com/test?image=test.png") is True
+    assert lf.is_valid_filetype("test.com/test.png") is False
+    assert lf.is_valid_filetype("test.com/test.JPG/") is False
+    assert lf.is_valid_filetype("test.com/test.js?v=1") is False
+    assert lf.is_valid_filetype("test.com/test.css#test") is False
+
+
+def test_classify_href_unfollowable():
+    lf.cache_clear()
+    for href in [
+        "#feed",
+        "javascript:void(0)",
+        "JavaScript:feed()",
+        "mailto:feed@test",
+    ]:
+        assert lf._classify_href(href, "application/rss+xml", True) is None
+    assert lf._classify_href("/feed", None, False) == (URL("/feed"), 3)
@@ -0,0 +1,107 @@
+import asyncio
+import base64
+
+from yarl import URL
+
+from feedsearch_crawler.crawler import Response
+from feedsearch_crawler.feed_spider import FeedsearchSpider, FeedInfo, SiteMeta
+from feedsearch_crawler.feed_spider.favicon import Favicon
+from feedsearch_crawler.feed_spider.lib import PNG_MAGIC
+from feedsearch_crawler.feed_spider.spider import EXECUTOR_ENCODE_MIN_SIZE
+
+
+def test_populate_feed_site_meta():
+    spider = FeedsearchSpider()
+    feed = FeedInfo(url=URL("https://feeds.test.com/rss.xml"))
+    other_feed = FeedInfo(url=URL("https://example.com/rss.xml"))
+    site_meta = SiteMeta(URL("https://test.com"), host="test.com", site_name="Test")
+    favicon = Favicon(
+        url=URL("https://test.com/favicon.ico"),
+        site_host="test.com",
+        priority=1,
+        data_uri="data_uri",
+    )
+
+    asyncio.run(spider.process_item(feed))
+    asyncio.run(spider.process_item(other_feed))
+    asyncio.run(spider.process_item(site_meta))
+    asyncio.run(spider.process_item(favicon))
+    asyncio.run(spider.populate_feed_site_meta())
+
+    assert feed.site_name == "Test"
+    assert feed.site_url == URL("https://test.com")
+    assert feed.favicon == URL("https://test.com/favicon.ico")
+    assert feed.favicon_data_uri == "data_uri"
+    assert other_feed.site_name == ""
+    assert other_feed.favicon == ""
+
+
+def test_find_links():
+    text = '<html><head><link rel="alternate" type="application/rss+xml" href="/rss.xml"></head><body><a href="/about">About</a><a>None</a></body></html>'
+
+    for htmlparser in ["lxml", "html.parser"]:
+        spider = FeedsearchSpider(htmlparser=htmlparser)
+        response = Response(
+            URL("https://test.com"),
+            "GET",
+            text=text,
+            status_code=200,
+            xml_parser=spider.parse_xml,
+        )
+
+        links = asyncio.run(spider.find_links(response))
+
+        assert [link.get("href") for link in links] == ["/rss.xml", "/about"]
+        assert links[0].get("type") == "application/rss+xml"
+
+
+def test_parse_favicon_data_uri():
+    spider = FeedsearchSpider()
+    url = URL("https://test.com/favicon.png")
+
+    for size in [16, EXECUTOR_ENCODE_MIN_SIZE + 1]:
+        data = PNG_MAGIC + b"\x00" * size
+        favicon = Favicon(url=url, site_host="test.com")
+        response = Response(url, "GET", data=data, status_code=200)
+
+        asyncio.run(spider.parse_favicon_data_uri(None, response, favicon))
+
+        expected = "data:image/png;base64," + base64.b64encode(data).decode()
+        assert favicon.data_uri == expected
+        assert spider.favicons[url] is favicon
+
+
+def test_is_allowed_domain():
+    spider = FeedsearchSpider(allowed_domains=["*.example.com", "test.com"])
+    assert spider.is_allowed_domain(URL("https://feeds.example.com/rss.xml"))
+    assert spider.is_allowed_domain(URL("https://test.com"))
+    assert not spider.is_allowed_domain(URL("https://example.com"))
+    assert not spider.is_allowed_domain(URL("https://test.com.au"))
+    assert not spider.is_allowed_domain(URL("/rss.xml"))
+
+    spider.allowed_domains = ["example.com"]
+    assert spider.is_allowed_domain(URL("https://example.com"))
+    assert not spider.is_allowed_domain(URL("https://test.com"))
+
+    assert FeedsearchSpider().is_allowed_domain(URL("https://test.com"))
+
+
+def test_is_allowed_domain_class_attribute():
+    class Spider(FeedsearchSpider):
+        allowed_domains = ["*.example.com"]
+
+    spider = Spider(allowed_domains=["*.example.com"])
+    assert spider.is_allowed_domain(URL("https://feeds.example.com/rss.xml"))
+    assert not spider.is_allowed_domain(URL("https://evil.com/"))
+
+
+def test_create_start_urls():
+    spider = FeedsearchSpider()
+    start_urls = spider.create_start_urls(
+        ["test.com", "https://test.com/", "https://test.com/blog"]
+    )
+    assert start_urls == [
+        URL("http://test.com"),
+        URL("https://test.com/"),
+        URL("https://test.com/blog"),
+    ]
@@ -0,0 +1,50 @@
+import asyncio
+from xml.etree import ElementTree
+
+from yarl import URL
+
+from feedsearch_crawler import output_opml, output_opml_async, sort_urls, FeedInfo
+
+
+def test_output_opml():
+    feeds = [
+        FeedInfo(
+            url=URL("https://test.com/rss.xml"),
+            title="Test & Feed\x0b",
+            site_url=URL("https://test.com"),
+            version="rss20",
+        ),
+        FeedInfo(title="No URL"),
+    ]
+
+    opml = output_opml(feeds)
+
+    assert opml.startswith(b"<?xml")
+    root = ElementTree.fromstring(opml)
+    assert root.get("version") == "2.0"
+    assert root.find("head/title").text == "Feeds"
+    outlines = root.findall("body/outline")
+    assert len(outlines) == 1
+    assert outlines[0].get("xmlUrl") == "https://test.com/rss.xml"
+    assert outlines[0].get("title") == "Test & Feed"
+    assert outlines[0].get("htmlUrl") == "https://test.com"
+    assert outlines[0].get("version") == "rss20"
+    assert outlines[0].get("description") is None
+
+    assert asyncio.run(output_opml_async(feeds)) == opml
+
+
+def test_sort_urls():
+    low = FeedInfo(url=URL("https://test.com/low"), score=1)
+    high = FeedInfo(url=URL("https://test.com/high"), score=10)
+    duplicate = FeedInfo(url=URL("https://test.com/high"), score=5)
+    first = FeedInfo(url=URL("https://test.com/first"), score=5)
+    second = FeedInfo(url=URL("https://test.com/second"), score=5)
+
+    better = FeedInfo(url=URL("https://test.com/low"), score=7)
+
+    result = sort_urls([low, high, first, "not a feed", duplicate, second, better])
+
+    assert result == [high, better, first, second]
+    assert result[0] is high
+    assert result[1] is better